@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Merge several exercise source files into one catalog, keyed by slug.
+
+Each source is sorted externally by slug in bounded memory (sorted runs are
+spilled to temporary files), then all sources are combined with a streaming
+k-way merge. When several sources define the same slug, fields are resolved
+with per-field policies and source priority; every disagreement is recorded
+in a conflict log written in the same pass.
+
+Sources are listed from highest to lowest priority. The merged catalog is a
+JSON array that can be fed straight into import_exercises.py.
+
+Usage:
+    python tools/merge_exercise_sources.py -o merged.json -c conflicts.jsonl \\
+        --curated tools/pilates_exercises.json \\
+        tools/pilates_exercises.json tools/yoga_positions.json vendor_dump.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from import_exercises import slugify
+
+# Field merge policies
+PRIORITY = "priority"  # first non-empty value in source priority order
+UNION = "union"  # ordered union of list values across sources
+CURATED = "curated"  # first non-empty value from a curated source, else PRIORITY
+
+FIELD_POLICIES = {
+    "secondaryMuscles": UNION,
+    "movementPatterns": UNION,
+    "workoutStyles": UNION,
+    "instructions": CURATED,
+}
+
+DEFAULT_CHUNK_SIZE = 10_000
+READ_SIZE = 1 << 16
+
+# (slug, source rank, position within source, record)
+Entry = Tuple[str, int, int, Dict[str, Any]]
+
+
+@dataclass
+class Source:
+    path: Path
+    rank: int
+    curated: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+def iter_records(path: Path) -> Iterator[Any]:
+    """Stream the items of a JSON array (or JSON Lines) file one at a time."""
+    with path.open("r", encoding="utf-8") as handle:
+        if path.suffix == ".jsonl":
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        decoder = json.JSONDecoder()
+        buffer = ""
+        pos = 0
+        eof = False
+        started = False
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    raise ValueError(f"{path}: unexpected end of file")
+                buffer = handle.read(READ_SIZE)
+                pos = 0
+                eof = not buffer
+                continue
+
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError(f"{path}: must contain a JSON array of exercise objects")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The item straddles the read boundary; buffer more and retry.
+                chunk = handle.read(READ_SIZE)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield item
+            pos = end
+
+
+def _write_run(entries: List[Entry], directory: Path, index: int) -> Path:
+    entries.sort(key=lambda entry: entry[:3])
+    run_path = directory / f"run-{index:05d}.jsonl"
+    with run_path.open("w", encoding="utf-8") as handle:
+        for entry in entries:
+            handle.write(json.dumps(entry, ensure_ascii=False))
+            handle.write("\n")
+    return run_path
+
+
+def _read_run(run_path: Path) -> Iterator[Entry]:
+    with run_path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            slug, rank, position, record = json.loads(line)
+            yield slug, rank, position, record
+
+
+def sorted_entries(
+    source: Source,
+    directory: Path,
+    chunk_size: int,
+    rejected: List[Mapping[str, Any]],
+) -> Iterator[Entry]:
+    """Externally sort one source by slug, holding at most ``chunk_size`` records."""
+    runs: List[Path] = []
+    chunk: List[Entry] = []
+
+    for position, record in enumerate(iter_records(source.path)):
+        name = record.get("name") if isinstance(record, Mapping) else None
+        if not isinstance(name, str) or not name.strip():
+            rejected.append(
+                {"source": source.name, "index": position, "error": "Entry has no name"}
+            )
+            continue
+        chunk.append((slugify(name), source.rank, position, dict(record)))
+        if len(chunk) >= chunk_size:
+            runs.append(_write_run(chunk, directory, len(runs)))
+            chunk = []
+
+    if not runs:
+        chunk.sort(key=lambda entry: entry[:3])
+        return iter(chunk)
+    if chunk:
+        runs.append(_write_run(chunk, directory, len(runs)))
+    return heapq.merge(*(_read_run(run) for run in runs), key=lambda entry: entry[:3])
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _union(values: Iterable[Any]) -> List[Any]:
+    merged: List[Any] = []
+    for value in values:
+        for item in value if isinstance(value, list) else [value]:
+            if item not in merged:
+                merged.append(item)
+    return merged
+
+
+def merge_group(
+    slug: str,
+    entries: Sequence[Entry],
+    sources: Sequence[Source],
+    policies: Mapping[str, str],
+) -> Tuple[Dict[str, Any], List[Mapping[str, Any]]]:
+    """Resolve every field of one slug; entries are already in priority order."""
+    fields: List[str] = []
+    for _, _, _, record in entries:
+        fields.extend(field for field in record if field not in fields)
+
+    merged: Dict[str, Any] = {}
+    conflicts: List[Mapping[str, Any]] = []
+
+    for field in fields:
+        candidates = [
+            (sources[rank], record[field])
+            for _, rank, _, record in entries
+            if not _is_empty(record.get(field))
+        ]
+        if not candidates:
+            merged[field] = next(record[field] for _, _, _, record in entries if field in record)
+            continue
+
+        policy = policies.get(field, PRIORITY)
+        if policy == UNION:
+            chosen = _union(value for _, value in candidates)
+        elif policy == CURATED:
+            curated = [value for source, value in candidates if source.curated]
+            chosen = curated[0] if curated else candidates[0][1]
+        else:
+            chosen = candidates[0][1]
+        merged[field] = chosen
+
+        distinct = {json.dumps(value, sort_keys=True) for _, value in candidates}
+        if len(distinct) > 1:
+            conflicts.append(
+                {
+                    "slug": slug,
+                    "field": field,
+                    "policy": policy,
+                    "values": [
+                        {"source": source.name, "value": value}
+                        for source, value in candidates
+                    ],
+                    "chosen": chosen,
+                }
+            )
+
+    return merged, conflicts
+
+
+def merge_sources(
+    sources: Sequence[Source],
+    output_path: Path,
+    conflicts_path: Path,
+    policies: Mapping[str, str] = FIELD_POLICIES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[int, int]:
+    """Write the merged catalog and conflict log; returns (exercises, conflicts)."""
+    rejected: List[Mapping[str, Any]] = []
+    merged_count = 0
+    conflict_count = 0
+
+    with tempfile.TemporaryDirectory(prefix="exercise-merge-") as tmp:
+        streams = []
+        for source in sources:
+            directory = Path(tmp) / f"source-{source.rank:03d}"
+            directory.mkdir()
+            streams.append(sorted_entries(source, directory, chunk_size, rejected))
+
+        merged_stream = heapq.merge(*streams, key=lambda entry: entry[:3])
+
+        with output_path.open("w", encoding="utf-8") as output, conflicts_path.open(
+            "w", encoding="utf-8"
+        ) as log:
+            output.write("[")
+            for slug, group in itertools.groupby(merged_stream, key=lambda entry: entry[0]):
+                record, conflicts = merge_group(slug, list(group), sources, policies)
+                output.write(",\n" if merged_count else "\n")
+                output.write(json.dumps(record, indent=2, ensure_ascii=False))
+                merged_count += 1
+                for conflict in conflicts:
+                    log.write(json.dumps(conflict, ensure_ascii=False))
+                    log.write("\n")
+                conflict_count += len(conflicts)
+            output.write("\n]\n")
+
+            for entry in rejected:
+                log.write(json.dumps(entry, ensure_ascii=False))
+                log.write("\n")
+
+    return merged_count, conflict_count + len(rejected)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Merge exercise source files into one catalog keyed by slug."
+    )
+    parser.add_argument(
+        "sources", nargs="+", type=Path, help="Source files, highest priority first"
+    )
+    parser.add_argument("-o", "--output", type=Path, required=True, help="Merged catalog path")
+    parser.add_argument("-c", "--conflicts", type=Path, required=True, help="Conflict log path (JSON Lines)")
+    parser.add_argument(
+        "--curated",
+        type=Path,
+        action="append",
+        default=[],
+        help="Mark a source as curated (its instructions win); repeatable",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Records held in memory per sorted run",
+    )
+    args = parser.parse_args(argv)
+
+    curated = {path.resolve() for path in args.curated}
+    sources = []
+    for rank, path in enumerate(args.sources):
+        path = path.resolve()
+        if not path.is_file():
+            raise FileNotFoundError(f"Input file not found: {path}")
+        sources.append(Source(path=path, rank=rank, curated=path in curated))
+
+    merged, conflicts = merge_sources(
+        sources, args.output.resolve(), args.conflicts.resolve(), chunk_size=args.chunk_size
+    )
+    print(f"Merged {merged} exercises from {len(sources)} sources into {args.output}")
+    print(f"{conflicts} conflicts written to {args.conflicts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,687 @@
+#!/usr/bin/env python3
+"""
+Score onboarding submissions in bulk using columnar NumPy arrays.
+
+Mirrors the Dart feature extraction in
+lib/models/fitness_profile_model/fitness_profile_extraction_extensions/
+(cardio, strength, balance, injuries, relative_objective_importance) so that
+the whole user base can be re-scored after a formula change. Answers are
+loaded once into one array per question and every feature is computed as an
+array expression across all users at once.
+
+Input is either a JSON array or JSON Lines file of /api/onboarding/submit
+payloads ({"answers": {...}}). Output is an .npz archive with one array per
+feature key (same keys as featuresMap in the app), plus the injuries matrix.
+
+Requires numpy.
+
+Usage:
+    python tools/score_onboarding_batch.py path/to/submissions.jsonl path/to/features.npz [YYYY-MM-DD]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+# Question IDs (see lib/workflow_views/onboarding_workflow/question_bank/questions/)
+AGE_ID = "age"
+GENDER_ID = "gender"
+RUN_ID = "Q4"
+FALL_HISTORY_ID = "Q4A"
+FALL_RISK_FACTORS_ID = "Q4B"
+PUSHUPS_ID = "Q5"
+SQUATS_ID = "Q6"
+CHAIR_STAND_ID = "Q6A"
+GOALS_ID = "fitness_goals"
+GLP1_ID = "glp1_medications"
+WEIGHT_ID = "weight"
+HEIGHT_ID = "height"
+INJURIES_ID = "Q1"
+
+# Answer values (AnswerConstants)
+YES = "yes"
+NO = "no"
+NONE = "none"
+FEAR_FALLING = "fear_falling"
+MOBILITY_AIDS = "mobility_aids"
+BALANCE_PROBLEMS = "balance"
+
+GENDER_MISSING = -1
+GENDER_MALE = 0
+GENDER_FEMALE = 1
+GENDER_OTHER = 2
+GENDER_CODES = {"male": GENDER_MALE, "female": GENDER_FEMALE}
+
+CHAIR_UNKNOWN = -1
+CHAIR_NO = 0
+CHAIR_YES = 1
+
+GOAL_VALUES = (
+    "lose_weight",
+    "build_muscle",
+    "improve_endurance",
+    "increase_flexibility",
+    "better_health",
+    "live_longer",
+)
+GOAL_INDEX = {goal: i for i, goal in enumerate(GOAL_VALUES)}
+
+# BodyPartConstants.allBodyParts, in the same anatomical order.
+BODY_PARTS = (
+    "neck", "shoulders", "chest", "lats", "traps",
+    "biceps", "triceps", "elbows", "forearms", "wrists",
+    "abdominals", "lower_back",
+    "hips", "glutes", "quadriceps", "hamstrings",
+    "knees", "calves", "shins", "ankles", "feet",
+)
+BODY_PART_INDEX = {part: i for i, part in enumerate(BODY_PARTS)}
+INJURY_NO_ISSUE = 0
+INJURY_STRENGTHEN = 50
+INJURY_AVOID = -9223372036854775807
+
+# Cardio (CardioConstants)
+VO2_WALKING_SPEED_MULTIPLIER = 0.2
+VO2_RESTING_METABOLIC_RATE = 3.5
+VO2_TO_METS = 3.5
+DEFAULT_METS_CAPACITY = 8.0
+METERS_PER_MILE = 1609.34
+HR_ZONE_MULTIPLIERS = (0.55, 0.65, 0.75, 0.85, 0.92)
+MET_ZONE_MULTIPLIERS = (0.4, 0.6, 0.75, 0.85, 0.95)
+CARDIO_PERCENTILES = np.array([5.0, 10.0, 25.0, 50.0, 75.0, 90.0, 95.0])
+# Rows: 20-29, 30-39, 40-49, 50-59, 60-69, 70-79
+VO2MAX_NORMS = np.array([
+    [  # male
+        [29.0, 32.1, 40.1, 48.0, 55.2, 61.8, 66.3],
+        [27.2, 30.2, 35.9, 42.4, 49.2, 56.5, 59.8],
+        [24.2, 26.8, 31.9, 37.8, 45.0, 52.1, 55.6],
+        [20.9, 22.8, 27.1, 32.6, 39.7, 45.6, 50.7],
+        [17.4, 19.8, 23.7, 28.2, 34.5, 40.3, 43.0],
+        [16.3, 17.1, 20.4, 24.4, 30.4, 36.6, 39.7],
+    ],
+    [  # female
+        [21.7, 23.9, 30.5, 37.6, 44.7, 51.3, 56.0],
+        [19.0, 20.9, 25.3, 30.2, 36.1, 41.4, 45.8],
+        [17.0, 18.8, 22.1, 26.7, 32.4, 38.4, 41.7],
+        [16.0, 17.3, 19.9, 23.4, 27.6, 32.0, 35.9],
+        [13.4, 14.6, 17.2, 20.0, 23.8, 27.0, 29.4],
+        [13.1, 13.6, 15.6, 18.3, 20.8, 23.1, 24.1],
+    ],
+])
+
+# Strength norms (ACSMPushupNorms / ACSMSquatNorms), keyed by ascending
+# percentile. Rows: 20-29, 30-39, 40-49, 50-59, 60+
+PUSHUP_NORM_PERCENTILES = np.append(np.arange(5.0, 100.0, 5.0), 99.0)
+PUSHUP_NORMS = np.array([
+    [  # male
+        [13, 18, 20, 22, 24, 26, 27, 29, 31, 33, 35, 37, 39, 41, 44, 47, 51, 57, 62, 101],
+        [9, 10, 13, 15, 17, 19, 20, 21, 23, 25, 27, 30, 31, 34, 36, 39, 41, 46, 52, 87],
+        [5, 9, 10, 11, 14, 15, 16, 18, 19, 21, 22, 24, 25, 26, 29, 30, 34, 36, 40, 65],
+        [3, 6, 7, 9, 9, 10, 11, 13, 15, 15, 17, 19, 20, 21, 24, 25, 28, 30, 39, 52],
+        [2, 3, 4, 5, 9, 10, 11, 13, 14, 15, 16, 18, 20, 20, 22, 23, 24, 26, 28, 40],
+    ],
+    [  # female
+        [9, 12, 14, 15, 16, 17, 18, 20, 21, 22, 24, 26, 30, 32, 34, 36, 39, 42, 45, 71],
+        [4, 6, 8, 9, 10, 13, 15, 16, 17, 19, 21, 23, 24, 28, 29, 31, 30, 32, 39, 57],
+        [2, 4, 7, 8, 9, 10, 11, 12, 13, 15, 16, 17, 18, 20, 22, 24, 24, 28, 33, 51],
+        [1, 2, 6, 7, 8, 9, 10, 11, 12, 13, 15, 16, 17, 19, 20, 21, 23, 25, 28, 32],
+        [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 15, 17, 17, 21],
+    ],
+], dtype=float)
+SQUAT_NORM_PERCENTILES = np.array([10.0, 25.0, 50.0, 75.0, 90.0])
+SQUAT_NORMS = np.array([
+    [  # male
+        [15, 22, 30, 40, 50],
+        [12, 20, 27, 35, 45],
+        [10, 16, 22, 30, 40],
+        [8, 12, 18, 25, 35],
+        [5, 10, 15, 20, 30],
+    ],
+    [  # female
+        [12, 20, 27, 35, 45],
+        [10, 17, 23, 30, 40],
+        [8, 13, 18, 25, 35],
+        [6, 10, 15, 20, 30],
+        [4, 8, 12, 17, 25],
+    ],
+], dtype=float)
+
+# Strength (StrengthConstants)
+UPPER_BODY_WEIGHT = 0.4
+LOWER_BODY_WEIGHT = 0.6
+VERY_LOW_BUT_FUNCTIONAL_PERCENTILE = 15.0
+CONSERVATIVE_ESTIMATE_PERCENTILE = 10.0
+DEFAULT_STRENGTH_PERCENTILE = 50.0
+
+# Relative objective importance (ObjectiveImportanceConstants)
+BMI_CONVERSION_FACTOR = 703.0
+LOW_BMI_THRESHOLD = 20.0
+CARDIO_FITNESS_GAP_THRESHOLD = 0.4
+CARDIO_FITNESS_GAP_MULTIPLIER = 0.6
+FUNCTIONAL_SCORE_CLAMP = (0.0, 2.0)
+
+
+@dataclass
+class SubmissionColumns:
+    """One array per onboarding answer, aligned by submission index.
+
+    Missing numeric answers are NaN. Multiple-choice answers are expanded to
+    one boolean column per option (goals, fall risk factors) or an integer
+    score per body part (injuries).
+    """
+
+    age: np.ndarray
+    gender: np.ndarray
+    run_distance_miles: np.ndarray
+    run_time_minutes: np.ndarray
+    pushups: np.ndarray
+    squats: np.ndarray
+    chair_stand: np.ndarray
+    fall_history: np.ndarray
+    fall_risk_factor_count: np.ndarray
+    fear_falling: np.ndarray
+    mobility_aids: np.ndarray
+    balance_problems: np.ndarray
+    goals: np.ndarray
+    glp1: np.ndarray
+    weight_pounds: np.ndarray
+    height_inches: np.ndarray
+    injuries: np.ndarray
+    has_injury_or_pain: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.age)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Rows with the age and gender answers every calculator requires."""
+        return ~np.isnan(self.age) & (self.gender != GENDER_MISSING)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _parse_number(value: Any) -> float:
+    if _is_number(value):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return np.nan
+    return np.nan
+
+
+def _parse_list(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    if isinstance(value, str):
+        return value.split(",")
+    return []
+
+
+def _parse_json_object(value: Any) -> Mapping[str, Any] | None:
+    if isinstance(value, Mapping):
+        return value
+    if isinstance(value, str):
+        try:
+            decoded = json.loads(value)
+        except ValueError:
+            return None
+        return decoded if isinstance(decoded, Mapping) else None
+    return None
+
+
+def _parse_age(value: Any, as_of: date) -> float:
+    if not isinstance(value, str):
+        return np.nan
+    try:
+        birth = datetime.fromisoformat(value)
+    except ValueError:
+        return np.nan
+    before_birthday = (as_of.month, as_of.day) < (birth.month, birth.day)
+    return float(as_of.year - birth.year - (1 if before_birthday else 0))
+
+
+def _parse_run(value: Any) -> tuple[float, float]:
+    if _is_number(value):
+        # Legacy Cooper test answer: distance only, always 12 minutes.
+        return float(value), 12.0
+    data = _parse_json_object(value)
+    if data is None:
+        return np.nan, np.nan
+    distance = data.get("distanceMiles")
+    minutes = data.get("timeMinutes")
+    distance = float(distance) if _is_number(distance) else 0.0
+    minutes = float(int(minutes)) if _is_number(minutes) else 30.0
+    return distance, minutes
+
+
+def _parse_height_inches(value: Any) -> float:
+    data = _parse_json_object(value)
+    if data is None:
+        return np.nan
+    feet, inches = data.get("feet"), data.get("inches")
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in (feet, inches)):
+        return np.nan
+    return float(feet * 12 + inches)
+
+
+def columns_from_answers(
+    answers: Sequence[Mapping[str, Any]], as_of: date | None = None
+) -> SubmissionColumns:
+    """Load answer maps into columnar arrays.
+
+    ``as_of`` is the date ages are calculated against (defaults to today), so
+    a re-scoring run is reproducible.
+    """
+    as_of = as_of or date.today()
+    n = len(answers)
+
+    age = np.full(n, np.nan)
+    gender = np.full(n, GENDER_MISSING, dtype=np.int8)
+    run_distance = np.full(n, np.nan)
+    run_time = np.full(n, np.nan)
+    pushups = np.full(n, np.nan)
+    squats = np.full(n, np.nan)
+    chair_stand = np.full(n, CHAIR_UNKNOWN, dtype=np.int8)
+    fall_history = np.zeros(n, dtype=bool)
+    risk_count = np.zeros(n)
+    fear_falling = np.zeros(n, dtype=bool)
+    mobility_aids = np.zeros(n, dtype=bool)
+    balance_problems = np.zeros(n, dtype=bool)
+    goals = np.zeros((n, len(GOAL_VALUES)), dtype=bool)
+    glp1 = np.zeros(n, dtype=bool)
+    weight = np.full(n, np.nan)
+    height = np.full(n, np.nan)
+    injuries = np.full((n, len(BODY_PARTS)), INJURY_NO_ISSUE, dtype=np.int64)
+    has_injury_or_pain = np.zeros(n, dtype=bool)
+
+    for row, answer in enumerate(answers):
+        age[row] = _parse_age(answer.get(AGE_ID), as_of)
+
+        raw_gender = answer.get(GENDER_ID)
+        if isinstance(raw_gender, str):
+            gender[row] = GENDER_CODES.get(raw_gender, GENDER_OTHER)
+
+        run_distance[row], run_time[row] = _parse_run(answer.get(RUN_ID))
+        pushups[row] = _parse_number(answer.get(PUSHUPS_ID))
+        squats[row] = _parse_number(answer.get(SQUATS_ID))
+
+        chair = answer.get(CHAIR_STAND_ID)
+        if chair == YES:
+            chair_stand[row] = CHAIR_YES
+        elif chair == NO:
+            chair_stand[row] = CHAIR_NO
+
+        fall_history[row] = answer.get(FALL_HISTORY_ID) == YES
+
+        risk_factors = _parse_list(answer.get(FALL_RISK_FACTORS_ID))
+        risk_count[row] = sum(1 for factor in risk_factors if factor != NONE)
+        fear_falling[row] = FEAR_FALLING in risk_factors
+        mobility_aids[row] = MOBILITY_AIDS in risk_factors
+        balance_problems[row] = BALANCE_PROBLEMS in risk_factors
+
+        # An unanswered goals question counts as "better health".
+        selected_goals = _parse_list(answer.get(GOALS_ID)) or ["better_health"]
+        for goal in selected_goals:
+            if goal in GOAL_INDEX:
+                goals[row, GOAL_INDEX[goal]] = True
+
+        glp1[row] = answer.get(GLP1_ID) == YES
+        weight[row] = _parse_number(answer.get(WEIGHT_ID))
+        height[row] = _parse_height_inches(answer.get(HEIGHT_ID))
+
+        # Injuries are applied before pain, so pain wins on the same body part.
+        areas = _parse_list(answer.get(INJURIES_ID))
+        injured = [a[len("injury_"):] for a in areas if a.startswith("injury_")]
+        painful = [a[len("pain_"):] for a in areas if a.startswith("pain_")]
+        for part in injured:
+            if part in BODY_PART_INDEX:
+                injuries[row, BODY_PART_INDEX[part]] = INJURY_AVOID
+        for part in painful:
+            if part in BODY_PART_INDEX:
+                injuries[row, BODY_PART_INDEX[part]] = INJURY_STRENGTHEN
+        has_injury_or_pain[row] = bool(injured or painful)
+
+    return SubmissionColumns(
+        age=age,
+        gender=gender,
+        run_distance_miles=run_distance,
+        run_time_minutes=run_time,
+        pushups=pushups,
+        squats=squats,
+        chair_stand=chair_stand,
+        fall_history=fall_history,
+        fall_risk_factor_count=risk_count,
+        fear_falling=fear_falling,
+        mobility_aids=mobility_aids,
+        balance_problems=balance_problems,
+        goals=goals,
+        glp1=glp1,
+        weight_pounds=weight,
+        height_inches=height,
+        injuries=injuries,
+        has_injury_or_pain=has_injury_or_pain,
+    )
+
+
+def _norm_percentile(
+    counts: np.ndarray, norms: np.ndarray, keys: np.ndarray
+) -> np.ndarray:
+    """Vectorized ACSMPushupNorms/ACSMSquatNorms.getPercentile.
+
+    ``norms`` holds each user's norm row (n, k) in ascending percentile order.
+    """
+    x = counts
+    lowest, highest = norms[:, 0], norms[:, -1]
+    rows = np.arange(len(x))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        below = np.where(
+            lowest <= 0,
+            0.0,
+            np.clip(np.clip(x / lowest, 0.0, 1.0) * keys[0], 0.0, keys[0]),
+        )
+
+        # First segment whose upper bound covers the count.
+        hits = x[:, None] <= norms[:, 1:]
+        segment = np.argmax(hits, axis=1)
+        lower_v, upper_v = norms[rows, segment], norms[rows, segment + 1]
+        lower_k, upper_k = keys[segment], keys[segment + 1]
+        span = upper_v - lower_v
+        within = np.where(
+            span <= 0,
+            upper_k,
+            np.clip(lower_k + (x - lower_v) / span * (upper_k - lower_k), lower_k, upper_k),
+        )
+
+        top_span = highest - norms[:, -2]
+        above = np.where(
+            top_span <= 0,
+            min(keys[-1], 100.0),
+            np.clip(
+                keys[-1] + (x - highest) / top_span * (keys[-1] - keys[-2]),
+                keys[-1],
+                100.0,
+            ),
+        )
+
+    return np.select([x <= lowest, hits.any(axis=1)], [below, within], above)
+
+
+def _score_cardio(cols: SubmissionColumns, features: Dict[str, np.ndarray]) -> None:
+    age, gender = cols.age, cols.gender
+    distance, minutes = cols.run_distance_miles, cols.run_time_minutes
+    has_run = (distance > 0) & (minutes > 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pace = np.where(has_run, minutes / distance, np.nan)
+        vo2_cost = VO2_WALKING_SPEED_MULTIPLIER * (METERS_PER_MILE / pace) + VO2_RESTING_METABOLIC_RATE
+    # The app looks up %VO2max from the truncated pace value.
+    whole_pace = np.trunc(pace)
+    percent_vo2max = np.select(
+        [whole_pace <= 12, whole_pace <= 20, whole_pace <= 30, whole_pace <= 45,
+         whole_pace <= 60, whole_pace <= 90, whole_pace <= 150, whole_pace <= 240],
+        [100.0, 95.0, 90.0, 85.0, 80.0, 75.0, 70.0, 65.0],
+        55.0,
+    )
+    vo2max = vo2_cost / (percent_vo2max / 100.0)
+    mets = vo2max / VO2_TO_METS
+
+    features["cardio_pace"] = pace
+    features["vo2max"] = vo2max
+    features["mets_capacity"] = mets
+
+    age_group = np.clip((np.nan_to_num(age) - 20) // 10, 0, 5).astype(int)
+    sex = np.where(gender == GENDER_FEMALE, 1, 0)
+    norms = VO2MAX_NORMS[sex, age_group]
+    hits = vo2max[:, None] <= norms
+    first = np.argmax(hits, axis=1)
+    rows = np.arange(len(age))
+    lower_i = np.maximum(first - 1, 0)
+    lower_v, upper_v = norms[rows, lower_i], norms[rows, first]
+    lower_p, upper_p = CARDIO_PERCENTILES[lower_i], CARDIO_PERCENTILES[first]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        interpolated = lower_p + (vo2max - lower_v) / (upper_v - lower_v) * (upper_p - lower_p)
+    percentile = np.select(
+        [~hits.any(axis=1), first == 0],
+        [95.0, CARDIO_PERCENTILES[0]],
+        interpolated,
+    )
+    percentile = np.where(gender == GENDER_OTHER, 50.0, percentile)
+    features["cardio_fitness_percentile"] = np.where(has_run, percentile, np.nan)
+
+    max_hr = 208 - 0.7 * age
+    features["max_heart_rate"] = max_hr
+    for zone, multiplier in enumerate(HR_ZONE_MULTIPLIERS, start=1):
+        features[f"hr_zone{zone}"] = max_hr * multiplier
+
+    zone_mets = np.where(np.isnan(mets), DEFAULT_METS_CAPACITY, mets)
+    for zone, multiplier in enumerate(MET_ZONE_MULTIPLIERS, start=1):
+        features[f"met_zone{zone}"] = zone_mets * multiplier
+
+    features["cardio_recovery_hours"] = np.select([age < 40, age < 60], [24.0, 48.0], 72.0)
+
+
+def _score_strength(cols: SubmissionColumns, features: Dict[str, np.ndarray]) -> None:
+    age = cols.age
+    sex = np.where(cols.gender == GENDER_MALE, 0, 1)
+    group = np.clip((np.nan_to_num(age) - 20) // 10, 0, 4).astype(int)
+
+    pushups = np.trunc(cols.pushups)
+    has_pushups = pushups >= 0
+    upper = _norm_percentile(pushups, PUSHUP_NORMS[sex, group], PUSHUP_NORM_PERCENTILES)
+    # Push-up norms have no 18-19 bracket, so teenagers score 0.
+    upper = np.where(age < 20, 0.0, upper)
+    upper = np.where(has_pushups, upper, np.nan)
+    features["upper_body_strength_percentile"] = upper
+    features["pushup_count"] = np.where(has_pushups, pushups, np.nan)
+
+    squats = np.trunc(cols.squats)
+    has_squats = squats >= 0
+    squat_percentile = _norm_percentile(squats, SQUAT_NORMS[sex, group], SQUAT_NORM_PERCENTILES)
+    no_squat_percentile = np.select(
+        [cols.chair_stand == CHAIR_YES, cols.chair_stand == CHAIR_NO],
+        [VERY_LOW_BUT_FUNCTIONAL_PERCENTILE, 0.0],
+        CONSERVATIVE_ESTIMATE_PERCENTILE,
+    )
+    lower = np.where(squats == 0, no_squat_percentile, squat_percentile)
+    lower = np.where(has_squats, lower, np.nan)
+    features["lower_body_strength_percentile"] = lower
+    features["squat_count"] = np.where(has_squats, squats, np.nan)
+
+    overall = np.where(
+        has_pushups & has_squats,
+        upper * UPPER_BODY_WEIGHT + lower * LOWER_BODY_WEIGHT,
+        np.where(has_pushups, upper, lower),
+    )
+    features["strength_fitness_percentile"] = overall
+
+    features["strength_recovery_hours"] = np.select([age < 40, age < 60], [48.0, 72.0], 96.0)
+
+    pct = np.where(np.isnan(overall), DEFAULT_STRENGTH_PERCENTILE, overall)
+    beginner_reps = (age >= 50) | (pct < 25)
+    features["strength_optimal_rep_range_min"] = np.where(beginner_reps, 10.0, 8.0)
+    features["strength_optimal_rep_range_max"] = np.where(beginner_reps, 15.0, 12.0)
+    features["strength_time_between_sets"] = np.select([age >= 60, pct > 75], [45.0, 150.0], 90.0)
+    features["strength_percent_of_1RM"] = np.select(
+        [(age >= 50) & (pct < 50), pct < 25, pct > 75], [45.0, 40.0, 80.0], 55.0
+    )
+    features["strength_optimal_sets_range_min"] = np.select([pct < 10, pct > 75], [1.0, 3.0], 2.0)
+    features["strength_optimal_sets_range_max"] = np.select([pct < 10, pct > 75], [3.0, 5.0], 4.0)
+
+
+def _score_balance(cols: SubmissionColumns, features: Dict[str, np.ndarray]) -> None:
+    can_stand = (cols.chair_stand == CHAIR_YES).astype(float)
+    features["can_do_chair_stand"] = can_stand
+    features["fall_history"] = cols.fall_history.astype(float)
+    features["fall_risk_factor_count"] = cols.fall_risk_factor_count.astype(float)
+    features["fear_of_falling"] = cols.fear_falling.astype(float)
+    # Unknown chair stand ability is treated as unable, so this is the inverse.
+    features["needs_seated_exercises"] = 1.0 - can_stand
+
+
+def _score_relative_importance(
+    cols: SubmissionColumns, features: Dict[str, np.ndarray]
+) -> None:
+    age = cols.age
+    female = cols.gender == GENDER_FEMALE
+    goal = {name: cols.goals[:, i] for name, i in GOAL_INDEX.items()}
+    fallen = cols.fall_history
+    cannot_stand = cols.chair_stand == CHAIR_NO
+
+    cardio_percentile = features["cardio_fitness_percentile"]
+    fitness_gap = np.where(
+        cardio_percentile < CARDIO_FITNESS_GAP_THRESHOLD,
+        (CARDIO_FITNESS_GAP_THRESHOLD - cardio_percentile) * CARDIO_FITNESS_GAP_MULTIPLIER,
+        0.0,
+    )
+    cardio = (
+        0.25
+        + 0.4 * goal["lose_weight"]
+        + 0.5 * goal["improve_endurance"]
+        + 0.3 * goal["better_health"]
+        + 0.3 * goal["live_longer"]
+        + fitness_gap
+        + np.where(age >= 40, (age - 40) * 0.008, 0.0)
+        + 0.25  # no cardio activity reported
+        + 0.1 * (female & (age >= 50))
+        - 0.2 * cols.glp1
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bmi = cols.weight_pounds / (cols.height_inches * cols.height_inches) * BMI_CONVERSION_FACTOR
+    strength = (
+        0.3
+        + 0.5 * goal["build_muscle"]
+        + 0.25 * goal["better_health"]
+        + 0.25 * goal["live_longer"]
+        + np.where(age >= 30, (age - 30) * 0.01, 0.0)
+        + 0.1 * (female & (age >= 35))
+        + 0.15 * (female & (age >= 50))
+        + 0.2  # no strength activity reported
+        + 1.0 * cols.glp1
+        + 0.4 * ((age >= 35) & (bmi < LOW_BMI_THRESHOLD))
+    )
+
+    balance = (
+        0.1
+        + np.select([age >= 65, age >= 50, age >= 40], [0.6, 0.3, 0.1], 0.0)
+        + 0.4 * cols.balance_problems
+        + 0.2 * cols.fear_falling
+        + 0.3 * cols.mobility_aids
+        + 0.1 * (female & (age >= 45))
+    )
+    # Fall history is absolute priority.
+    balance = np.where(fallen, 1.0, balance)
+
+    stretching = (
+        0.15
+        + 0.4 * goal["increase_flexibility"]
+        + 0.2 * goal["better_health"]
+        + np.where(age >= 30, (age - 30) * 0.005, 0.0)
+        + 0.25 * cols.has_injury_or_pain
+        + 0.15  # no flexibility activity reported
+    )
+
+    functional_young = 0.3 * fallen + 0.5 * cannot_stand
+    functional_older = (
+        0.1
+        + np.select(
+            [age >= 80, age >= 70, age >= 65, age >= 60, age >= 55],
+            [0.7, 0.5, 0.35, 0.25, 0.15],
+            0.0,
+        )
+        + 0.6 * fallen
+        + 0.8 * cannot_stand
+        + 0.1 * (female & (age >= 65))
+        + 0.15 * (goal["better_health"] & (age >= 60))
+    )
+    functional = np.clip(
+        np.where(age < 50, functional_young, functional_older), *FUNCTIONAL_SCORE_CLAMP
+    )
+
+    total = cardio + strength + balance + stretching + functional
+    # The app leaves importance unset when the raw scores do not sum above 0.
+    total = np.where(total > 0, total, np.nan)
+    features["cardio"] = cardio / total
+    features["strength"] = strength / total
+    features["balance"] = balance / total
+    features["stretching"] = stretching / total
+    features["functional"] = functional / total
+
+
+def score(cols: SubmissionColumns) -> Dict[str, np.ndarray]:
+    """Compute featuresMap values for every submission.
+
+    Returns one float array per feature key. Features the app would leave
+    unset are NaN, and rows missing age or gender are NaN throughout.
+    """
+    features: Dict[str, np.ndarray] = {}
+    _score_strength(cols, features)
+    _score_balance(cols, features)
+    _score_cardio(cols, features)
+    _score_relative_importance(cols, features)
+
+    invalid = ~cols.valid
+    for key, values in features.items():
+        features[key] = np.where(invalid, np.nan, values.astype(float))
+    return features
+
+
+def load_submissions(path: Path) -> List[Any]:
+    """Read a JSON array or JSON Lines file of onboarding submissions."""
+    with path.open("r", encoding="utf-8") as handle:
+        if path.suffix == ".jsonl":
+            return [json.loads(line) for line in handle if line.strip()]
+        payload = json.load(handle)
+    if not isinstance(payload, list):
+        raise ValueError("Input file must contain a JSON array of onboarding submissions")
+    return payload
+
+
+def main(path: str, output: str, as_of: str | None = None) -> None:
+    source_path = Path(path).resolve()
+    if not source_path.is_file():
+        raise FileNotFoundError(f"Input file not found: {source_path}")
+
+    submissions = load_submissions(source_path)
+    answers = [
+        s["answers"] if isinstance(s, Mapping) and isinstance(s.get("answers"), Mapping) else {}
+        for s in submissions
+    ]
+    as_of_date = date.fromisoformat(as_of) if as_of else None
+    cols = columns_from_answers(answers, as_of_date)
+    features = score(cols)
+
+    output_path = Path(output).resolve()
+    np.savez_compressed(
+        output_path,
+        injuries=cols.injuries,
+        body_parts=np.array(BODY_PARTS),
+        **features,
+    )
+
+    invalid = int((~cols.valid).sum())
+    print(f"Scored {len(cols) - invalid} submissions into {output_path}")
+    if invalid:
+        print(f"{invalid} submissions missing age or gender were left unscored (NaN)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print(
+            "Usage: python tools/score_onboarding_batch.py path/to/submissions.jsonl "
+            "path/to/features.npz [YYYY-MM-DD]",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    main(*sys.argv[1:])
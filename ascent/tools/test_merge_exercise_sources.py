@@ -0,0 +1,107 @@
+"""Tests for merge_exercise_sources."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import merge_exercise_sources as merge
+
+TOOLS = Path(__file__).resolve().parent
+
+
+def _exercise(name, **fields):
+    record = {
+        "name": name,
+        "level": "beginner",
+        "primaryMuscles": ["abdominals"],
+        "secondaryMuscles": [],
+        "instructions": ["Do it."],
+    }
+    record.update(fields)
+    return record
+
+
+def _write(path, records):
+    path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+    return path
+
+
+def _merge(tmp_path, sources, chunk_size=2):
+    output = tmp_path / "merged.json"
+    conflicts = tmp_path / "conflicts.jsonl"
+    counts = merge.merge_sources(sources, output, conflicts, chunk_size=chunk_size)
+    log = [json.loads(line) for line in conflicts.read_text(encoding="utf-8").splitlines()]
+    return json.loads(output.read_text(encoding="utf-8")), log, counts
+
+
+def test_iter_records_streams_across_read_boundaries(monkeypatch):
+    monkeypatch.setattr(merge, "READ_SIZE", 7)
+    path = TOOLS / "yoga_positions.json"
+
+    streamed = list(merge.iter_records(path))
+
+    assert streamed == json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_merge_applies_priority_and_field_policies(tmp_path):
+    vendor = _write(
+        tmp_path / "vendor.json",
+        [
+            _exercise("Plank", level="expert", secondaryMuscles=["shoulders", "glutes"],
+                      instructions=["Vendor step."], equipment="body only"),
+            _exercise("Zebra Walk"),
+            _exercise("Bird Dog"),
+            {"level": "beginner"},
+        ],
+    )
+    curated = _write(
+        tmp_path / "curated.json",
+        [
+            _exercise("Plank", level="intermediate", instructions=["Curated step."]),
+            _exercise("Dead Bug"),
+        ],
+    )
+    base = _write(
+        tmp_path / "base.json",
+        [_exercise("Plank", level="beginner", secondaryMuscles=["lower back", "glutes"])],
+    )
+    sources = [
+        merge.Source(path=vendor, rank=0),
+        merge.Source(path=curated, rank=1, curated=True),
+        merge.Source(path=base, rank=2),
+    ]
+
+    merged, log, counts = _merge(tmp_path, sources)
+
+    assert [record["name"] for record in merged] == ["Bird Dog", "Dead Bug", "Plank", "Zebra Walk"]
+    plank = merged[2]
+    assert plank["level"] == "expert"
+    assert plank["secondaryMuscles"] == ["shoulders", "glutes", "lower back"]
+    assert plank["instructions"] == ["Curated step."]
+    assert plank["equipment"] == "body only"
+
+    conflicts = {(entry.get("slug"), entry.get("field")) for entry in log}
+    assert conflicts == {
+        ("Plank", "level"),
+        ("Plank", "secondaryMuscles"),
+        ("Plank", "instructions"),
+        (None, None),
+    }
+    assert {"source": "vendor.json", "index": 3, "error": "Entry has no name"} in log
+    assert counts == (4, 4)
+
+
+def test_merge_is_deterministic_regardless_of_chunk_size(tmp_path):
+    sources = [
+        merge.Source(path=TOOLS / "pilates_exercises.json", rank=0, curated=True),
+        merge.Source(path=TOOLS / "yoga_positions.json", rank=1),
+    ]
+
+    small, small_log, _ = _merge(tmp_path, sources, chunk_size=3)
+    large, large_log, _ = _merge(tmp_path, sources, chunk_size=100_000)
+
+    assert small == large
+    assert small_log == large_log
+    slugs = [merge.slugify(record["name"]) for record in small]
+    assert slugs == sorted(set(slugs))
@@ -0,0 +1,380 @@
+"""Parity tests for score_onboarding_batch against the Dart feature extraction.
+
+The reference functions below follow the Dart extensions branch for branch,
+one profile at a time, so the vectorized scorer can be checked against them
+on the persona fixtures used by test/onboarding_personas_test.dart.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import score_onboarding_batch as batch
+
+AS_OF = date(2025, 9, 22)
+PERSONA_RESULTS = Path(__file__).resolve().parents[1] / "test" / "results" / "persona_distribution.json"
+
+EDGE_PROFILES = [
+    # Teenager (no push-up bracket), km run, injuries and pain on one part.
+    {
+        "age": "2009-03-01",
+        "gender": "male",
+        "Q4": {"distanceMiles": 1.5, "timeMinutes": 14, "selectedUnit": "km"},
+        "Q5": 12,
+        "Q6": 20,
+        "fitness_goals": ["build_muscle", "improve_endurance"],
+        "Q1": ["injury_knees", "pain_knees", "pain_lower_back"],
+    },
+    # Cannot squat or stand from a chair, on GLP-1, low BMI.
+    {
+        "age": "1958-06-30",
+        "gender": "female",
+        "Q4": 0.3,
+        "Q4A": "no",
+        "Q4B": ["mobility_aids", "none"],
+        "Q5": "3",
+        "Q6": 0,
+        "Q6A": "no",
+        "glp1_medications": "yes",
+        "weight": 100,
+        "height": {"feet": 5, "inches": 8},
+    },
+    # Non-binary, chair stand unanswered, string encoded answers.
+    {
+        "age": "1980-12-31T00:00:00.000",
+        "gender": "non_binary",
+        "Q4": "{\"distanceMiles\":3.1,\"timeMinutes\":25}",
+        "Q6": "0",
+        "fitness_goals": "increase_flexibility,live_longer",
+        "Q4B": "fear_falling,balance",
+        "height": "{\"feet\":6,\"inches\":0}",
+        "weight": "150",
+    },
+    # Very fast runner above the 95th percentile, pushups above the 99th.
+    {
+        "age": "1995-01-01",
+        "gender": "male",
+        "Q4": {"distanceMiles": 3.0, "timeMinutes": 15},
+        "Q5": 120.7,
+        "Q6": 60,
+    },
+    # Missing gender: unscored.
+    {"age": "1990-01-01", "Q5": 10},
+]
+
+
+# MARK: reference implementation (one profile at a time)
+
+
+def _age(answers):
+    return batch._parse_age(answers.get("age"), AS_OF)
+
+
+def _norm_percentile(count, age, gender, table, keys, bracket):
+    if bracket is None:
+        return 0.0
+    values = table[0 if gender.lower() == "male" else 1][bracket]
+    entries = list(zip(keys, values))
+    lowest_k, lowest_v = entries[0]
+    highest_k, highest_v = entries[-1]
+    if count <= lowest_v:
+        if lowest_v <= 0:
+            return 0.0
+        return min(max(min(max(count / lowest_v, 0.0), 1.0) * lowest_k, 0.0), lowest_k)
+    for (lower_k, lower_v), (upper_k, upper_v) in zip(entries, entries[1:]):
+        if count <= upper_v:
+            span = upper_v - lower_v
+            if span <= 0:
+                return upper_k
+            percentile = lower_k + (count - lower_v) / span * (upper_k - lower_k)
+            return min(max(percentile, lower_k), upper_k)
+    prev_k, prev_v = entries[-2]
+    span = highest_v - prev_v
+    if span <= 0:
+        return min(max(highest_k, 0.0), 100.0)
+    estimated = highest_k + (count - highest_v) / span * (highest_k - prev_k)
+    return min(max(estimated, highest_k), 100.0)
+
+
+def _bracket(age, top):
+    for i, limit in enumerate((30, 40, 50, 60, 70)):
+        if age < limit:
+            return min(i, top)
+    return top
+
+
+def _reference_cardio(answers, age, gender, features):
+    distance, minutes = batch._parse_run(answers.get("Q4"))
+    if distance > 0 and minutes > 0:
+        pace = minutes / distance
+        features["cardio_pace"] = pace
+        vo2_cost = 0.2 * (1609.34 / pace) + 3.5
+        t = int(pace)
+        for limit, pct in ((12, 100.0), (20, 95.0), (30, 90.0), (45, 85.0),
+                           (60, 80.0), (90, 75.0), (150, 70.0), (240, 65.0)):
+            if t <= limit:
+                break
+        else:
+            pct = 55.0
+        vo2max = vo2_cost / (pct / 100.0)
+        features["vo2max"] = vo2max
+        features["mets_capacity"] = vo2max / 3.5
+        if gender not in ("male", "female"):
+            percentile = 50.0
+        else:
+            values = batch.VO2MAX_NORMS[0 if gender == "male" else 1][_bracket(age, 5)]
+            percentiles = batch.CARDIO_PERCENTILES
+            percentile = 95.0
+            for i, value in enumerate(values):
+                if vo2max <= value:
+                    if i == 0:
+                        percentile = percentiles[0]
+                    else:
+                        ratio = (vo2max - values[i - 1]) / (value - values[i - 1])
+                        percentile = percentiles[i - 1] + ratio * (percentiles[i] - percentiles[i - 1])
+                    break
+        features["cardio_fitness_percentile"] = percentile
+
+    max_hr = 208 - 0.7 * age
+    features["max_heart_rate"] = max_hr
+    for zone, multiplier in enumerate(batch.HR_ZONE_MULTIPLIERS, start=1):
+        features[f"hr_zone{zone}"] = max_hr * multiplier
+    mets = features.get("mets_capacity", 8.0)
+    for zone, multiplier in enumerate(batch.MET_ZONE_MULTIPLIERS, start=1):
+        features[f"met_zone{zone}"] = mets * multiplier
+    features["cardio_recovery_hours"] = 24.0 if age < 40 else (48.0 if age < 60 else 72.0)
+
+
+def _reference_strength(answers, age, gender, features):
+    upper = lower = None
+    pushups = batch._parse_number(answers.get("Q5"))
+    if not math.isnan(pushups) and int(pushups) >= 0:
+        count = int(pushups)
+        bracket = None if age < 20 else _bracket(age, 4)
+        upper = _norm_percentile(count, age, gender, batch.PUSHUP_NORMS,
+                                 batch.PUSHUP_NORM_PERCENTILES, bracket)
+        features["upper_body_strength_percentile"] = upper
+        features["pushup_count"] = float(count)
+
+    squats = batch._parse_number(answers.get("Q6"))
+    if not math.isnan(squats) and int(squats) >= 0:
+        count = int(squats)
+        features["squat_count"] = float(count)
+        if count == 0:
+            chair = answers.get("Q6A")
+            lower = 15.0 if chair == "yes" else (0.0 if chair == "no" else 10.0)
+        else:
+            lower = _norm_percentile(count, age, gender, batch.SQUAT_NORMS,
+                                     batch.SQUAT_NORM_PERCENTILES, _bracket(age, 4))
+        features["lower_body_strength_percentile"] = lower
+
+    if upper is not None and lower is not None:
+        features["strength_fitness_percentile"] = upper * 0.4 + lower * 0.6
+    elif upper is not None:
+        features["strength_fitness_percentile"] = upper
+    elif lower is not None:
+        features["strength_fitness_percentile"] = lower
+
+    features["strength_recovery_hours"] = 48.0 if age < 40 else (72.0 if age < 60 else 96.0)
+    pct = features.get("strength_fitness_percentile", 50.0)
+    if age >= 50 or pct < 25:
+        features["strength_optimal_rep_range_min"], features["strength_optimal_rep_range_max"] = 10.0, 15.0
+    else:
+        features["strength_optimal_rep_range_min"], features["strength_optimal_rep_range_max"] = 8.0, 12.0
+    if age >= 60:
+        features["strength_time_between_sets"] = 45.0
+    elif pct > 75:
+        features["strength_time_between_sets"] = 150.0
+    else:
+        features["strength_time_between_sets"] = 90.0
+    if age >= 50 and pct < 50:
+        features["strength_percent_of_1RM"] = 45.0
+    elif pct < 25:
+        features["strength_percent_of_1RM"] = 40.0
+    elif pct > 75:
+        features["strength_percent_of_1RM"] = 80.0
+    else:
+        features["strength_percent_of_1RM"] = 55.0
+    if pct < 10:
+        features["strength_optimal_sets_range_min"], features["strength_optimal_sets_range_max"] = 1.0, 3.0
+    elif pct > 75:
+        features["strength_optimal_sets_range_min"], features["strength_optimal_sets_range_max"] = 3.0, 5.0
+    else:
+        features["strength_optimal_sets_range_min"], features["strength_optimal_sets_range_max"] = 2.0, 4.0
+
+
+def _reference_balance(answers, features):
+    chair = answers.get("Q6A")
+    features["can_do_chair_stand"] = 1.0 if chair == "yes" else 0.0
+    features["fall_history"] = 1.0 if answers.get("Q4A") == "yes" else 0.0
+    factors = [f for f in batch._parse_list(answers.get("Q4B")) if f != "none"]
+    features["fall_risk_factor_count"] = float(len(factors))
+    features["fear_of_falling"] = 1.0 if "fear_falling" in factors else 0.0
+    can_stand = {"yes": True, "no": False}.get(chair, features["can_do_chair_stand"] == 1.0)
+    features["needs_seated_exercises"] = 1.0 if can_stand is False else 0.0
+
+
+def _reference_importance(answers, age, gender, features):
+    goals = batch._parse_list(answers.get("fitness_goals")) or ["better_health"]
+    fallen = answers.get("Q4A") == "yes"
+    chair_no = answers.get("Q6A") == "no"
+    female = gender == "female"
+    glp1 = answers.get("glp1_medications") == "yes"
+
+    cardio = 0.25
+    cardio += 0.4 * ("lose_weight" in goals) + 0.5 * ("improve_endurance" in goals)
+    cardio += 0.3 * ("better_health" in goals) + 0.3 * ("live_longer" in goals)
+    percentile = features.get("cardio_fitness_percentile")
+    if percentile is not None and percentile < 0.4:
+        cardio += (0.4 - percentile) * 0.6
+    if age >= 40:
+        cardio += (age - 40) * 0.008
+    cardio += 0.25
+    if female and age >= 50:
+        cardio += 0.1
+    if glp1:
+        cardio -= 0.2
+
+    strength = 0.3
+    strength += 0.5 * ("build_muscle" in goals) + 0.25 * ("better_health" in goals)
+    strength += 0.25 * ("live_longer" in goals)
+    if age >= 30:
+        strength += (age - 30) * 0.01
+    if female:
+        strength += 0.1 * (age >= 35) + 0.15 * (age >= 50)
+    strength += 0.2
+    if glp1:
+        strength += 1.0
+    if age >= 35:
+        weight = batch._parse_number(answers.get("weight"))
+        height = batch._parse_height_inches(answers.get("height"))
+        if not math.isnan(weight) and not math.isnan(height):
+            if weight / (height * height) * 703.0 < 20.0:
+                strength += 0.4
+
+    if fallen:
+        balance = 1.0
+    else:
+        balance = 0.1
+        if age >= 65:
+            balance += 0.6
+        elif age >= 50:
+            balance += 0.3
+        elif age >= 40:
+            balance += 0.1
+        factors = batch._parse_list(answers.get("Q4B"))
+        balance += 0.4 * ("balance" in factors) + 0.2 * ("fear_falling" in factors)
+        balance += 0.3 * ("mobility_aids" in factors)
+        if female and age >= 45:
+            balance += 0.1
+
+    stretching = 0.15 + 0.4 * ("increase_flexibility" in goals) + 0.2 * ("better_health" in goals)
+    if age >= 30:
+        stretching += (age - 30) * 0.005
+    areas = batch._parse_list(answers.get("Q1"))
+    if any(a.startswith("injury_") or a.startswith("pain_") for a in areas):
+        stretching += 0.25
+    stretching += 0.15
+
+    if age < 50:
+        functional = 0.3 * fallen + 0.5 * chair_no
+    else:
+        functional = 0.1
+        for limit, bonus in ((80, 0.7), (70, 0.5), (65, 0.35), (60, 0.25), (55, 0.15)):
+            if age >= limit:
+                functional += bonus
+                break
+        functional += 0.6 * fallen + 0.8 * chair_no
+        if female and age >= 65:
+            functional += 0.1
+        if "better_health" in goals and age >= 60:
+            functional += 0.15
+    functional = min(max(functional, 0.0), 2.0)
+
+    total = cardio + strength + balance + stretching + functional
+    for key, raw in (("cardio", cardio), ("strength", strength), ("balance", balance),
+                     ("stretching", stretching), ("functional", functional)):
+        features[key] = raw / total
+
+
+def reference_features(answers):
+    age, gender = _age(answers), answers.get("gender")
+    if math.isnan(age) or not isinstance(gender, str):
+        return {}
+    features = {}
+    _reference_strength(answers, age, gender, features)
+    _reference_balance(answers, features)
+    _reference_cardio(answers, age, gender, features)
+    _reference_importance(answers, age, gender, features)
+    return features
+
+
+# MARK: tests
+
+
+def _fixture_profiles():
+    personas = json.loads(PERSONA_RESULTS.read_text(encoding="utf-8"))["results"]
+    return [p["raw_answers"] for p in personas] + EDGE_PROFILES
+
+
+def test_matches_reference_for_fixture_profiles():
+    profiles = _fixture_profiles()
+    features = batch.score(batch.columns_from_answers(profiles, AS_OF))
+
+    for row, answers in enumerate(profiles):
+        expected = reference_features(answers)
+        for key, values in features.items():
+            actual = values[row]
+            if key in expected:
+                assert actual == pytest.approx(expected[key], rel=1e-12, abs=1e-12), (row, key)
+            else:
+                assert np.isnan(actual), (row, key)
+
+
+def test_importance_sums_to_one_and_invalid_rows_are_nan():
+    profiles = _fixture_profiles()
+    cols = batch.columns_from_answers(profiles, AS_OF)
+    features = batch.score(cols)
+    total = sum(features[key] for key in ("cardio", "strength", "balance", "stretching", "functional"))
+
+    np.testing.assert_allclose(total[cols.valid], 1.0)
+    assert not cols.valid[-1]
+    assert all(np.isnan(values[-1]) for values in features.values())
+
+
+def test_injuries_matrix_pain_overrides_injury():
+    cols = batch.columns_from_answers(EDGE_PROFILES, AS_OF)
+    knees = batch.BODY_PART_INDEX["knees"]
+    lower_back = batch.BODY_PART_INDEX["lower_back"]
+
+    assert cols.injuries[0, knees] == batch.INJURY_STRENGTHEN
+    assert cols.injuries[0, lower_back] == batch.INJURY_STRENGTHEN
+    assert cols.injuries[0].sum() == 2 * batch.INJURY_STRENGTHEN
+    assert not cols.injuries[1:].any()
+
+
+def test_known_profile_values():
+    # 30 year old male, 1 mile in 10 minutes, 25 push-ups and 27 squats.
+    answers = {
+        "age": "1995-01-01",
+        "gender": "male",
+        "Q4": {"distanceMiles": 1.0, "timeMinutes": 10},
+        "Q5": 25,
+        "Q6": 27,
+    }
+    features = batch.score(batch.columns_from_answers([answers], AS_OF))
+
+    assert features["vo2max"][0] == pytest.approx(0.2 * 160.934 + 3.5)
+    assert features["cardio_fitness_percentile"][0] == pytest.approx(
+        10.0 + (35.6868 - 30.2) / (35.9 - 30.2) * 15.0
+    )
+    assert features["upper_body_strength_percentile"][0] == 50.0
+    assert features["lower_body_strength_percentile"][0] == 50.0
+    assert features["strength_fitness_percentile"][0] == 50.0
+    assert features["max_heart_rate"][0] == pytest.approx(208 - 0.7 * 30)